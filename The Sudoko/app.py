@@ -1,13 +1,23 @@
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, render_template, request, jsonify, Response, stream_with_context
 import os
+import json
+import secrets
+import threading
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 from solver import SudokuSolver
 from recognizer import SudokuRecognizer
 from generator import SudokuGenerator
+from codec import GridCodec
 
 app = Flask(__name__)
 app.config['UPLOAD_FOLDER'] = 'uploads'
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
+app.config['MAX_GENERATE_COUNT'] = 100  # Max puzzles per /generate request
+app.config['MAX_SOLVE_BATCH'] = 100  # Max grids per text/binary /solve request
+app.config['MAX_SOLVE_STEPS'] = 1000000  # Solver candidate checks per /solve request (about 7s of CPU)
+app.config['MAX_STREAM_COUNT'] = 10000  # Max puzzles per /generate/stream request
+app.config['STREAM_WORKERS'] = int(os.environ.get('STREAM_WORKERS', 1))  # Shared pool size; 1 = no pool
 
 # Create upload directory
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
@@ -16,6 +26,69 @@ os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 solver = SudokuSolver()
 generator = SudokuGenerator()
 recognizer = SudokuRecognizer()
+codec = GridCodec()
+
+# One process pool shared by every /generate/stream request, created on first use
+stream_pool = None
+stream_pool_lock = threading.Lock()
+
+def get_stream_pool():
+    """Return the shared generation pool, or None when STREAM_WORKERS is 1."""
+    global stream_pool
+    if app.config['STREAM_WORKERS'] <= 1:
+        return None
+    with stream_pool_lock:
+        if stream_pool is None:
+            stream_pool = ProcessPoolExecutor(max_workers=app.config['STREAM_WORKERS'])
+    return stream_pool
+
+def read_grids():
+    """Parse the request body into an (n, 9, 9) array and a batch flag, based on its content type.
+
+    application/octet-stream: a batch of packed 41-byte grids
+    text/plain: a batch of 81-character grid strings, one per line
+    application/json: a single {"grid": [[...], ...]} or {"grid": "81-character string"}
+    """
+    if request.mimetype in (GridCodec.BINARY, GridCodec.TEXT):
+        if request.mimetype == GridCodec.BINARY:
+            grids = codec.unpack(request.get_data())
+        else:
+            grids = codec.from_lines(request.get_data(as_text=True))
+        if len(grids) > app.config['MAX_SOLVE_BATCH']:
+            raise ValueError(f"Batch exceeds {app.config['MAX_SOLVE_BATCH']} grids")
+        return grids, True
+    
+    data = request.get_json()
+    grid = data.get('grid')
+    if isinstance(grid, str):
+        return codec.stack(codec.from_string(grid)), False
+    if not grid or len(grid) != 9 or any(len(row) != 9 for row in grid):
+        raise ValueError('Invalid grid format')
+    return codec.stack(grid), False
+
+def read_count(data, limit):
+    """Parse the optional 'count' field, raising ValueError for bad or out-of-range values."""
+    count = data.get('count', 1)
+    if isinstance(count, bool) or not isinstance(count, int):
+        raise ValueError('count must be an integer')
+    if not 1 <= count <= limit:
+        raise ValueError(f"count must be between 1 and {limit}")
+    return count
+
+def grids_response(key, grids, batch=False):
+    """Encode grids in the format preferred by the Accept header (JSON by default).
+
+    JSON batches always use the plural key, whatever their length.
+    """
+    mimetype = request.accept_mimetypes.best_match(GridCodec.MIMETYPES, default=GridCodec.JSON)
+    if mimetype == GridCodec.BINARY:
+        return Response(codec.pack(grids), mimetype=GridCodec.BINARY)
+    if mimetype == GridCodec.TEXT:
+        return Response(codec.to_lines(grids), mimetype=GridCodec.TEXT)
+    
+    if not batch:
+        return jsonify({key: grids[0].tolist()})
+    return jsonify({key + 's': [grid.tolist() for grid in grids]})
 
 @app.route('/')
 def index():
@@ -24,20 +97,36 @@ def index():
 @app.route('/solve', methods=['POST'])
 def solve_sudoku():
     try:
-        data = request.get_json()
-        grid = data.get('grid')
+        try:
+            grids, batch = read_grids()
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
-        if not grid or len(grid) != 9 or any(len(row) != 9 for row in grid):
-            return jsonify({'error': 'Invalid grid format'}), 400
+        # One step budget for the whole request; grids it doesn't cover stay unsolved
+        budget = app.config['MAX_SOLVE_STEPS']
+        solutions = []
+        exhausted = False
+        for grid in grids:
+            if budget <= 0 or not solver.is_valid_puzzle(grid):
+                solutions.append(None)
+                exhausted = exhausted or budget <= 0
+                continue
+            found, steps, finished = solver.solve_limited(grid, budget)
+            budget -= steps
+            exhausted = exhausted or not finished
+            solutions.append(found[0] if found else None)
         
-        # Convert to numpy array and solve
-        sudoku_grid = np.array(grid, dtype=int)
-        solution = solver.solve(sudoku_grid.copy())
+        if not batch:
+            if solutions[0] is not None:
+                return grids_response('solution', solutions)
+            elif exhausted:
+                return jsonify({'error': 'Puzzle could not be solved within the step budget'}), 400
+            else:
+                return jsonify({'error': 'No solution exists'}), 400
         
-        if solution is not None:
-            return jsonify({'solution': solution.tolist()})
-        else:
-            return jsonify({'error': 'No solution exists'}), 400
+        # Batches keep their order; unsolvable or unsolved grids come back as all zeros
+        solutions = [s if s is not None else np.zeros((9, 9), dtype=int) for s in solutions]
+        return grids_response('solution', np.array(solutions), batch=True)
             
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -61,14 +150,23 @@ def upload_image():
         filepath = os.path.join(app.config['UPLOAD_FOLDER'], file.filename)
         file.save(filepath)
         
-        # Recognize sudoku from image
+        # Recognize sudoku from image ('page' mode reads every grid on the image)
+        if request.values.get('mode') == 'page':
+            grids = recognizer.recognize_sudoku_page(filepath)
+            os.remove(filepath)
+            
+            if grids:
+                return grids_response('grid', codec.stack(grids), batch=True)
+            else:
+                return jsonify({'error': 'Could not recognize any Sudoku grid from image'}), 400
+        
         grid = recognizer.recognize_sudoku(filepath)
         
         # Clean up uploaded file
         os.remove(filepath)
         
         if grid is not None:
-            return jsonify({'grid': grid.tolist()})
+            return grids_response('grid', codec.stack(grid))
         else:
             return jsonify({'error': 'Could not recognize Sudoku grid from image'}), 400
             
@@ -78,11 +176,42 @@ def upload_image():
 @app.route('/generate', methods=['POST'])
 def generate_puzzle():
     try:
-        data = request.get_json()
+        data = request.get_json(silent=True) or {}
         difficulty = data.get('difficulty', 'medium')
+        try:
+            count = read_count(data, app.config['MAX_GENERATE_COUNT'])
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        puzzles = np.array([generator.generate(difficulty) for _ in range(count)])
+        return grids_response('puzzle', puzzles, batch='count' in data)
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/generate/stream', methods=['POST'])
+def generate_stream():
+    try:
+        data = request.get_json(silent=True) or {}
+        difficulty = data.get('difficulty', 'medium')
+        seed = data.get('seed')
+        
+        try:
+            count = read_count(data, app.config['MAX_STREAM_COUNT'])
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        if seed is None:
+            seed = secrets.randbits(53)  # Stays exact as a JavaScript number
+        elif isinstance(seed, bool) or not isinstance(seed, int) or seed < 0:
+            return jsonify({'error': 'seed must be a non-negative integer'}), 400
+        
+        pool = get_stream_pool()
+        
+        def lines():
+            for index, puzzle in generator.iter_generate(difficulty, seed, count, pool):
+                yield json.dumps({'index': index, 'seed': seed, 'puzzle': puzzle.tolist()}) + '\n'
         
-        puzzle = generator.generate(difficulty)
-        return jsonify({'puzzle': puzzle.tolist()})
+        return Response(stream_with_context(lines()), mimetype='application/x-ndjson')
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
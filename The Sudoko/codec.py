@@ -0,0 +1,72 @@
+import numpy as np
+
+class GridCodec:
+    """Convert Sudoku grids between JSON lists, 81-character strings and packed bytes."""
+
+    JSON = 'application/json'
+    TEXT = 'text/plain'
+    BINARY = 'application/octet-stream'
+    MIMETYPES = [JSON, TEXT, BINARY]
+
+    CELLS = 81
+    PACKED_SIZE = 41  # 81 cells at 4 bits each, padded to a whole byte
+
+    def __init__(self):
+        self.size = 9
+
+    def stack(self, grids):
+        """Validate a stack of grids and return it as an (n, 9, 9) int array."""
+        grids = np.asarray(grids)
+        # Reject floats, bools and mixed lists rather than silently truncating them
+        if grids.dtype.kind not in 'iu':
+            raise ValueError("Grid values must be integers")
+        grids = grids.astype(int)
+        if grids.ndim == 2:
+            grids = grids[np.newaxis]
+        if grids.ndim != 3 or grids.shape[1:] != (self.size, self.size):
+            raise ValueError("Invalid grid format")
+        if grids.min(initial=0) < 0 or grids.max(initial=0) > 9:
+            raise ValueError("Grid values must be between 0 and 9")
+        return grids
+
+    def to_string(self, grid):
+        """Encode a single grid as an 81-character string ('0' for empty cells)."""
+        grid = self.stack(grid)[0]
+        return (grid.ravel() + ord('0')).astype(np.uint8).tobytes().decode('ascii')
+
+    def from_string(self, text):
+        """Decode an 81-character string; '0' and '.' mark empty cells."""
+        text = text.strip().replace('.', '0')
+        if len(text) != self.CELLS or not text.isdigit():
+            raise ValueError("Grid string must contain exactly 81 digits")
+        return np.frombuffer(text.encode('ascii'), dtype=np.uint8).astype(int).reshape(9, 9) - ord('0')
+
+    def to_lines(self, grids):
+        """Encode one or more grids as newline-separated 81-character strings."""
+        return '\n'.join(self.to_string(grid) for grid in self.stack(grids)) + '\n'
+
+    def from_lines(self, text):
+        """Decode newline-separated 81-character strings into an (n, 9, 9) array."""
+        lines = [line for line in text.splitlines() if line.strip()]
+        if not lines:
+            raise ValueError("No grids in request body")
+        return np.array([self.from_string(line) for line in lines], dtype=int)
+
+    def pack(self, grids):
+        """Pack one or more grids into 41 bytes each, two cells per byte (high nibble first)."""
+        grids = self.stack(grids)
+        flat = np.zeros((len(grids), self.CELLS + 1), dtype=np.uint8)
+        flat[:, :self.CELLS] = grids.reshape(len(grids), self.CELLS)
+        return ((flat[:, 0::2] << 4) | flat[:, 1::2]).tobytes()
+
+    def unpack(self, data):
+        """Unpack a concatenation of 41-byte packed grids into an (n, 9, 9) array."""
+        if not data or len(data) % self.PACKED_SIZE != 0:
+            raise ValueError(f"Packed body must be a non-empty multiple of {self.PACKED_SIZE} bytes")
+        packed = np.frombuffer(data, dtype=np.uint8).reshape(-1, self.PACKED_SIZE)
+        flat = np.empty((len(packed), self.CELLS + 1), dtype=np.uint8)
+        flat[:, 0::2] = packed >> 4
+        flat[:, 1::2] = packed & 0x0F
+        if flat[:, self.CELLS].any():
+            raise ValueError("Packed grid has a non-zero padding nibble")
+        return self.stack(flat[:, :self.CELLS].reshape(-1, 9, 9))
@@ -1,12 +1,15 @@
 import numpy as np
 import random
+import itertools
+from collections import deque
 from solver import SudokuSolver
 
 class SudokuGenerator:
     """Generate Sudoku puzzles of varying difficulty."""
 
-    def __init__(self):
+    def __init__(self, seed=None):
         self.solver = SudokuSolver()
+        self.random = random.Random(seed)
         
     def generate_full_grid(self):
         """Generate a complete valid Sudoku grid."""
@@ -25,7 +28,7 @@ class SudokuGenerator:
     def fill_box(self, grid, row, col):
         """Fill a 3x3 box with random valid numbers."""
         numbers = list(range(1, 10))
-        random.shuffle(numbers)
+        self.random.shuffle(numbers)
         
         for i in range(3):
             for j in range(3):
@@ -53,7 +56,7 @@ class SudokuGenerator:
                     return True
         
         numbers = list(range(1, 10))
-        random.shuffle(numbers)
+        self.random.shuffle(numbers)
         
         for num in numbers:
             if self.solver.is_valid(grid, i, j, num):
@@ -78,7 +81,7 @@ class SudokuGenerator:
         
         # Calculate the desired number of filled cells
         min_fill, max_fill = fill_counts.get(difficulty, (40, 45))
-        target_fill = random.randint(min_fill, max_fill)
+        target_fill = self.random.randint(min_fill, max_fill)
         
         puzzle = grid.copy()
         total_cells = 81
@@ -88,7 +91,7 @@ class SudokuGenerator:
         
         # Generate all possible cell positions in a random order
         positions = [(i, j) for i in range(9) for j in range(9)]
-        random.shuffle(positions)
+        self.random.shuffle(positions)
         
         for i, j in positions:
             if removed >= (total_cells - target_fill) or attempts >= max_attempts:
@@ -144,3 +147,46 @@ class SudokuGenerator:
         full_grid = self.generate_full_grid()
         puzzle = self.remove_numbers(full_grid, difficulty)
         return puzzle
+
+    def puzzle_seed(self, seed, index):
+        """Derive an independent RNG seed for puzzle number index of a seeded run."""
+        state = np.random.SeedSequence(seed, spawn_key=(index,)).generate_state(4)
+        return int.from_bytes(state.tobytes(), 'little')
+    
+    def iter_generate(self, difficulty='medium', seed=None, count=None, pool=None, window=8):
+        """Yield (index, puzzle) pairs as soon as each puzzle is ready.
+        
+        Puzzle i depends only on (seed, i), so a run is reproducible with or
+        without a pool. If count is None, generation runs until the caller stops.
+        pool is a caller-owned executor (e.g. one ProcessPoolExecutor shared by the
+        whole app); at most window jobs per call are queued on it at a time.
+        """
+        if seed is None:
+            seed = np.random.SeedSequence().entropy
+        indices = range(count) if count is not None else itertools.count()
+        
+        if pool is None:
+            for index in indices:
+                yield index, SudokuGenerator(self.puzzle_seed(seed, index)).generate(difficulty)
+            return
+        
+        # Keep a bounded window of jobs in flight so results stream in order
+        pending = deque()
+        try:
+            for index in indices:
+                pending.append((index, pool.submit(generate_seeded, difficulty, self.puzzle_seed(seed, index))))
+                if len(pending) >= window:
+                    done, future = pending.popleft()
+                    yield done, future.result()
+            
+            while pending:
+                done, future = pending.popleft()
+                yield done, future.result()
+        finally:
+            # Don't leave queued work on the shared pool if the caller stops early
+            for _, future in pending:
+                future.cancel()
+
+def generate_seeded(difficulty, seed):
+    """Generate one puzzle from a fixed seed (module-level so worker processes can pickle it)."""
+    return SudokuGenerator(seed).generate(difficulty)
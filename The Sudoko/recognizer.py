@@ -4,6 +4,8 @@ import numpy as np
 import pytesseract
 from PIL import Image
 import os
+import heapq
+from solver import SudokuSolver
 
 class SudokuRecognizer:
     """Advanced Sudoku grid recognition with multiple detection strategies."""
@@ -12,6 +14,12 @@ class SudokuRecognizer:
         # Configure Tesseract (uncomment and adjust path if needed on Windows)
         # pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
         self.debug = False
+        self.solver = SudokuSolver()
+        self.ocr_configs = [
+            '--oem 3 --psm 10 -c tessedit_char_whitelist=123456789',
+            '--oem 3 --psm 8 -c tessedit_char_whitelist=123456789',
+            '--oem 1 --psm 10 -c tessedit_char_whitelist=123456789'
+        ]
         
     def preprocess_image(self, image_path):
         """Multi-strategy image preprocessing."""
@@ -23,22 +31,31 @@ class SudokuRecognizer:
         # Store original for later use
         original = img.copy()
         
+        img, gray = self.resize_and_gray(img)
+        
+        if self.debug:
+            cv2.imwrite('debug_01_original.jpg', img)
+            cv2.imwrite('debug_02_gray.jpg', gray)
+        
+        return img, gray, original
+    
+    def resize_and_gray(self, img, max_side=800):
+        """Shrink an image so its longest side is at most max_side and convert to grayscale."""
         # Resize if too large
         height, width = img.shape[:2]
-        if max(height, width) > 800:
-            scale = 800 / max(height, width)
+        if max(height, width) > max_side:
+            scale = max_side / max(height, width)
             new_width = int(width * scale)
             new_height = int(height * scale)
             img = cv2.resize(img, (new_width, new_height), interpolation=cv2.INTER_AREA)
         
         # Convert to grayscale
-        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-        
-        if self.debug:
-            cv2.imwrite('debug_01_original.jpg', img)
-            cv2.imwrite('debug_02_gray.jpg', gray)
+        if len(img.shape) == 3:
+            gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+        else:
+            gray = img.copy()
         
-        return img, gray, original
+        return img, gray
     
     def create_multiple_thresholds(self, gray):
         """Create multiple threshold versions for robust detection."""
@@ -79,17 +96,17 @@ class SudokuRecognizer:
         
         return thresholds
     
-    def find_grid_contours(self, thresh_image):
+    def find_grid_contours(self, thresh_image, mode=cv2.RETR_EXTERNAL, limit=10):
         """Find potential Sudoku grid contours."""
         # Find contours
-        contours, _ = cv2.findContours(thresh_image, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        contours, _ = cv2.findContours(thresh_image, mode, cv2.CHAIN_APPROX_SIMPLE)
         
         # Sort by area (largest first)
         contours = sorted(contours, key=cv2.contourArea, reverse=True)
         
         grid_candidates = []
         
-        for contour in contours[:10]:  # Check top 10 largest contours
+        for contour in contours[:limit]:  # Check the largest contours
             area = cv2.contourArea(contour)
             
             # Skip very small contours
@@ -191,6 +208,84 @@ class SudokuRecognizer:
             
         return best_candidate
     
+    def rect_overlap(self, a, b):
+        """Intersection over union of two (x, y, w, h) rectangles."""
+        x1, y1 = max(a[0], b[0]), max(a[1], b[1])
+        x2, y2 = min(a[0] + a[2], b[0] + b[2]), min(a[1] + a[3], b[1] + b[3])
+        inter = max(0, x2 - x1) * max(0, y2 - y1)
+        union = a[2] * a[3] + b[2] * b[3] - inter
+        return inter / union if union else 0.0
+    
+    def has_grid_lines(self, gray, contour, min_coverage=0.5):
+        """Check that a quad shows the 8 interior lines of a 9x9 grid in both directions.
+        
+        Page frames and paper edges pass the shape checks but not this one.
+        """
+        warped = self.extract_grid(gray, contour)
+        lines = cv2.adaptiveThreshold(
+            warped, 255, cv2.ADAPTIVE_THRESH_MEAN_C, cv2.THRESH_BINARY_INV, 15, 5
+        ) > 0
+        
+        size = warped.shape[0]
+        tolerance = max(2, size // 60)
+        row_coverage = lines.mean(axis=1)  # Fraction of each row that is dark
+        col_coverage = lines.mean(axis=0)
+        
+        for k in range(1, 9):
+            pos = int(round(k * size / 9))
+            window = slice(max(pos - tolerance, 0), pos + tolerance + 1)
+            if row_coverage[window].max() < min_coverage or col_coverage[window].max() < min_coverage:
+                return False
+        
+        return True
+    
+    def find_sudoku_grids(self, thresholds, gray):
+        """Find every Sudoku grid on a page, in reading order."""
+        candidates = []
+        
+        # Nested contours are needed here: a page border would otherwise hide the grids
+        for name, thresh in thresholds:
+            candidates.extend(self.find_grid_contours(thresh, cv2.RETR_LIST, limit=50))
+        
+        # The same quad is usually found by several thresholds; keep the largest copy
+        unique = []
+        for area, contour, rect in sorted(candidates, key=lambda c: c[0], reverse=True):
+            if not any(self.rect_overlap(rect, other) > 0.8 for _, _, other in unique):
+                unique.append((area, contour, rect))
+        
+        # Only quads with 9x9 line structure can be grids (drops boxes, cells, most frames)
+        lined = [c for c in unique if self.has_grid_lines(gray, c[1])]
+        
+        def center(rect):
+            return (rect[0] + rect[2] / 2.0, rect[1] + rect[3] / 2.0)
+        
+        def contains(outer, inner):
+            return (inner[0] < 0.5 * outer[0] and
+                    cv2.pointPolygonTest(outer[1], center(inner[2]), False) >= 0)
+        
+        # A page frame can line up with the grids' own lines by chance, but a real grid
+        # never holds two smaller grids
+        lined = [c for c in lined if sum(contains(c, other) for other in lined) < 2]
+        
+        # Largest first; anything centred inside an accepted grid is a duplicate or a box
+        grids = []
+        for area, contour, rect in lined:
+            if any(cv2.pointPolygonTest(grid, center(rect), False) >= 0 for grid, _ in grids):
+                continue
+            grids.append((contour, rect))
+        
+        if not grids:
+            return []
+        
+        # Group into rows by top edge, then left to right
+        row_height = np.median([rect[3] for _, rect in grids]) / 2
+        grids.sort(key=lambda g: (int(g[1][1] // row_height), g[1][0]))
+        
+        if self.debug:
+            print(f"Found {len(grids)} grid(s) on page")
+        
+        return [contour for contour, _ in grids]
+    
     def order_points(self, pts):
         """Order points consistently."""
         pts = pts.reshape(4, 2)
@@ -235,8 +330,8 @@ class SudokuRecognizer:
         
         return warped
     
-    def segment_and_recognize(self, grid_image):
-        """Segment grid into cells and recognize digits."""
+    def extract_cells(self, grid_image):
+        """Segment grid into 81 thresholded cell images (None where a cell is too small)."""
         # Convert to grayscale if needed
         if len(grid_image.shape) == 3:
             gray = cv2.cvtColor(grid_image, cv2.COLOR_BGR2GRAY)
@@ -253,8 +348,7 @@ class SudokuRecognizer:
         h, w = thresh.shape
         cell_h, cell_w = h // 9, w // 9
         
-        # Create result grid
-        result = np.zeros((9, 9), dtype=int)
+        cells = []
         
         for i in range(9):
             for j in range(9):
@@ -266,33 +360,46 @@ class SudokuRecognizer:
                 x2 = (j + 1) * cell_w - margin
                 
                 if y2 <= y1 or x2 <= x1:
+                    cells.append(None)
                     continue
                 
-                cell = thresh[y1:y2, x1:x2]
-                digit = self.recognize_cell_digit(cell, i, j)
-                result[i][j] = digit
+                cells.append(thresh[y1:y2, x1:x2])
+        
+        return cells
+    
+    def segment_and_recognize(self, grid_image):
+        """Segment grid into cells and recognize digits."""
+        cells = self.extract_cells(grid_image)
+        
+        # Create result grid
+        result = np.zeros((9, 9), dtype=int)
+        
+        for index, cell in enumerate(cells):
+            if cell is not None:
+                i, j = divmod(index, 9)
+                result[i][j] = self.recognize_cell_digit(cell, i, j)
         
         return result
     
-    def recognize_cell_digit(self, cell, row, col):
-        """Recognize digit in a single cell."""
+    def prepare_cell(self, cell, row, col):
+        """Isolate the digit in a cell and pad it for OCR; None if the cell is empty."""
         # Check if cell is mostly empty
         white_ratio = np.sum(cell == 0) / (cell.shape[0] * cell.shape[1])
         if white_ratio > 0.9:
-            return 0
+            return None
         
         # Find the largest connected component (should be the digit)
         contours, _ = cv2.findContours(cell, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
         
         if not contours:
-            return 0
+            return None
         
         # Get the largest contour
         largest_contour = max(contours, key=cv2.contourArea)
         
         # Check if contour is significant enough
         if cv2.contourArea(largest_contour) < 20:
-            return 0
+            return None
         
         # Create a clean version with just the largest contour
         mask = np.zeros_like(cell)
@@ -308,14 +415,20 @@ class SudokuRecognizer:
         if self.debug:
             cv2.imwrite(f'debug_cell_{row}_{col}.jpg', padded)
         
-        # Try OCR
-        configs = [
-            '--oem 3 --psm 10 -c tessedit_char_whitelist=123456789',
-            '--oem 3 --psm 8 -c tessedit_char_whitelist=123456789',
-            '--oem 1 --psm 10 -c tessedit_char_whitelist=123456789'
-        ]
+        return padded
+    
+    def recognize_cell_digit(self, cell, row, col):
+        """Recognize digit in a single cell."""
+        padded = self.prepare_cell(cell, row, col)
+        if padded is None:
+            return 0
         
-        for config in configs:
+        return self.ocr_digit(padded)
+    
+    def ocr_digit(self, padded):
+        """Run Tesseract on one prepared cell, trying several configs."""
+        # Try OCR
+        for config in self.ocr_configs:
             try:
                 text = pytesseract.image_to_string(padded, config=config).strip()
                 # Clean up result
@@ -330,6 +443,234 @@ class SudokuRecognizer:
         
         return 0  # Default to empty if OCR fails
     
+    def cell_hypotheses(self, padded, configs):
+        """Return the distinct (digit, confidence) readings of a prepared cell, best first.
+        
+        With single-character page segmentation each config yields at most one
+        reading, so a cell has at most len(configs) alternatives, and often one.
+        """
+        scores = {}
+        for config in configs:
+            try:
+                data = pytesseract.image_to_data(padded, config=config, output_type=pytesseract.Output.DICT)
+            except Exception:
+                continue
+            
+            for text, conf in zip(data['text'], data['conf']):
+                digits_only = ''.join(filter(str.isdigit, str(text)))
+                if digits_only and 1 <= int(digits_only[0]) <= 9:
+                    digit = int(digits_only[0])
+                    scores[digit] = max(scores.get(digit, 0.0), max(float(conf), 0.0) / 100)
+        
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+    
+    def read_hypotheses(self, grid_image):
+        """Cheap first pass: prepared cells plus a ranked (digit, confidence) list per cell.
+        
+        Empty cells get [(0, 1.0)]; like ocr_digit, the remaining configs only run
+        when the first one reads nothing.
+        """
+        cells = self.extract_cells(grid_image)
+        prepared = [None] * 81
+        hypotheses = [[(0, 1.0)] for _ in range(81)]
+        
+        for index, cell in enumerate(cells):
+            if cell is None:
+                continue
+            padded = self.prepare_cell(cell, *divmod(index, 9))
+            if padded is None:
+                continue
+            
+            prepared[index] = padded
+            readings = (self.cell_hypotheses(padded, self.ocr_configs[:1]) or
+                        self.cell_hypotheses(padded, self.ocr_configs[1:]))
+            hypotheses[index] = readings or [(0, 0.5)]
+        
+        return prepared, hypotheses
+    
+    def find_conflicts(self, grid):
+        """Flat indices of cells holding a digit repeated in their row, column or box."""
+        flat = np.asarray(grid).reshape(81)
+        units = ([[r * 9 + c for c in range(9)] for r in range(9)] +
+                 [[r * 9 + c for r in range(9)] for c in range(9)] +
+                 [[(br + r) * 9 + bc + c for r in range(3) for c in range(3)]
+                  for br in range(0, 9, 3) for bc in range(0, 9, 3)])
+        
+        conflicts = set()
+        for unit in units:
+            seen = {}
+            for index in unit:
+                if flat[index] != 0:
+                    seen.setdefault(flat[index], []).append(index)
+            for indices in seen.values():
+                if len(indices) > 1:
+                    conflicts.update(indices)
+        
+        return sorted(conflicts)
+    
+    def decode_grid(self, prepared, hypotheses, max_suspects=6, max_steps=200000):
+        """Pick the most likely assignment that is consistent and solvable.
+        
+        Only cells in a conflict (or, if there is none, the least confident
+        readings) are re-read with every OCR config; the search then walks their
+        reading combinations best-first. Blanking a suspect is allowed only if the
+        result still has a unique solution. All solver work shares one budget of
+        max_steps candidate checks; when it runs out the top readings are returned.
+        """
+        best = np.array([h[0][0] for h in hypotheses], dtype=int).reshape(9, 9)
+        budget = max_steps
+        
+        if self.solver.is_valid_puzzle(best):
+            found, steps, finished = self.solver.solve_limited(best, budget)
+            budget -= steps
+            if found:
+                return best
+        
+        suspects = self.find_conflicts(best)
+        if not suspects:
+            suspects = [i for i in range(81) if prepared[i] is not None and best.flat[i] != 0]
+        suspects = sorted(suspects, key=lambda index: hypotheses[index][0][1])[:max_suspects]
+        
+        if self.debug:
+            print(f"Re-reading {len(suspects)} suspect cell(s): {suspects}")
+        
+        # Each suspect keeps its OCR readings plus "empty" as a low-confidence escape hatch
+        options = []
+        for index in suspects:
+            scores = dict(hypotheses[index])
+            for digit, conf in self.cell_hypotheses(prepared[index], self.ocr_configs):
+                scores[digit] = max(scores.get(digit, 0.0), conf)
+            scores.setdefault(0, 0.05)
+            ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+            options.append([(digit, -np.log(max(conf, 1e-3))) for digit, conf in ranked])
+        
+        # Best-first over choice vectors, cost = sum of -log(confidence)
+        start = (0,) * len(suspects)
+        heap = [(sum(opts[0][1] for opts in options), start)]
+        visited = {start}
+        while heap and budget > 0:
+            cost, choice = heapq.heappop(heap)
+            
+            candidate = best.copy()
+            blanked = False
+            for index, opts, pick in zip(suspects, options, choice):
+                candidate.flat[index] = opts[pick][0]
+                blanked = blanked or (opts[pick][0] == 0 and best.flat[index] != 0)
+            
+            # The top readings were already checked above
+            if not np.array_equal(candidate, best) and self.solver.is_valid_puzzle(candidate):
+                # Dropping a clue must not turn the puzzle into one with several answers
+                found, steps, finished = self.solver.solve_limited(
+                    candidate, budget, max_solutions=2 if blanked else 1
+                )
+                budget -= steps
+                if found and (not blanked or (finished and len(found) == 1)):
+                    return candidate
+            
+            for k, opts in enumerate(options):
+                if choice[k] + 1 < len(opts):
+                    nxt = choice[:k] + (choice[k] + 1,) + choice[k + 1:]
+                    if nxt not in visited:
+                        visited.add(nxt)
+                        step = opts[choice[k] + 1][1] - opts[choice[k]][1]
+                        heapq.heappush(heap, (cost + step, nxt))
+        
+        if self.debug and budget <= 0:
+            print("Decoder step budget exhausted; keeping top readings")
+        
+        return best
+    
+    def recognize_cells_batch(self, cells, tiles_per_row=16):
+        """Recognize many cells with a single Tesseract call on a tiled mosaic.
+        
+        Cells the mosaic pass leaves unread fall back to per-cell OCR.
+        """
+        digits = [0] * len(cells)
+        prepared = []
+        for index, cell in enumerate(cells):
+            if cell is None:
+                continue
+            padded = self.prepare_cell(cell, *divmod(index % 81, 9))
+            if padded is not None:
+                prepared.append((index, padded))
+        
+        if not prepared:
+            return digits
+        
+        # Lay prepared cells out on a grid of fixed-size tiles, dark digits on white
+        tile = prepared[0][1].shape[0]
+        rows = (len(prepared) + tiles_per_row - 1) // tiles_per_row
+        mosaic = np.zeros((rows * tile, tiles_per_row * tile), dtype=np.uint8)
+        for slot, (index, padded) in enumerate(prepared):
+            r, c = divmod(slot, tiles_per_row)
+            mosaic[r * tile:(r + 1) * tile, c * tile:(c + 1) * tile] = padded
+        mosaic = cv2.bitwise_not(mosaic)
+        
+        if self.debug:
+            cv2.imwrite('debug_09_cell_mosaic.jpg', mosaic)
+        
+        read = {}
+        try:
+            boxes = pytesseract.image_to_boxes(
+                mosaic, config='--oem 3 --psm 6 -c tessedit_char_whitelist=123456789'
+            )
+            # Each line: "<char> <left> <bottom> <right> <top> <page>", y measured from the bottom
+            for line in boxes.splitlines():
+                parts = line.split()
+                if len(parts) < 5 or not parts[0].isdigit():
+                    continue
+                x_center = (int(parts[1]) + int(parts[3])) / 2
+                y_center = mosaic.shape[0] - (int(parts[2]) + int(parts[4])) / 2
+                slot = int(y_center // tile) * tiles_per_row + int(x_center // tile)
+                if 0 <= slot < len(prepared) and slot not in read:
+                    read[slot] = int(parts[0])
+        except Exception:
+            pass
+        
+        for slot, (index, padded) in enumerate(prepared):
+            digit = read.get(slot, 0)
+            digits[index] = digit if 1 <= digit <= 9 else self.ocr_digit(padded)
+        
+        return digits
+    
+    def recognize_sudoku_page(self, image_path):
+        """Recognize every Sudoku grid on a page; returns a list of 9x9 arrays."""
+        try:
+            print(f"Starting page recognition for: {image_path}")
+            
+            # Thresholds and contours are computed once for the whole page
+            img, gray, original = self.preprocess_image(image_path)
+            thresholds = self.create_multiple_thresholds(gray)
+            grid_contours = self.find_sudoku_grids(thresholds, gray)
+            
+            if not grid_contours:
+                print("✗ Could not detect any Sudoku grid")
+                return []
+            
+            print(f"✓ Detected {len(grid_contours)} grid(s)")
+            
+            # Warp every grid, then read all of their cells in one batch
+            cells = []
+            for contour in grid_contours:
+                cells.extend(self.extract_cells(self.extract_grid(gray, contour)))
+            
+            digits = self.recognize_cells_batch(cells)
+            results = [np.array(digits[k:k + 81], dtype=int).reshape(9, 9)
+                       for k in range(0, len(digits), 81)]
+            
+            # Drop grids with no digits (false detections)
+            results = [result for result in results if np.sum(result != 0) > 0]
+            print(f"✓ Recognized {len(results)} grid(s)")
+            
+            return results
+            
+        except Exception as e:
+            print(f"✗ Error in page recognition: {str(e)}")
+            if self.debug:
+                import traceback
+                traceback.print_exc()
+            return []
+    
     def recognize_sudoku(self, image_path):
         """Main recognition method with comprehensive error handling."""
         try:
@@ -370,8 +711,9 @@ class SudokuRecognizer:
             
             print("✓ Grid extracted and warped")
             
-            # Step 5: Segment and recognize digits
-            result = self.segment_and_recognize(warped)
+            # Step 5: Segment and recognize digits, resolving conflicts with the Sudoku rules
+            prepared, hypotheses = self.read_hypotheses(warped)
+            result = self.decode_grid(prepared, hypotheses)
             
             print("✓ Digit recognition complete")
             print("Recognized grid:")
@@ -425,7 +767,105 @@ def quick_test(image_path):
         print("3. Try cropping the image closer to the grid")
         print("4. Make sure the image is not too blurry or distorted")
 
+def draw_synthetic_page(path, frame=True, distort=False):
+    """Write a white page with six drawn 9x9 grids to path.
+    
+    frame adds a printed page frame; distort adds a perspective tilt and sensor noise.
+    """
+    page = np.full((780, 560), 255, np.uint8)
+    if frame:
+        cv2.rectangle(page, (5, 5), (554, 774), 0, 2)
+    
+    size = 240
+    cell = size / 9
+    for x0, y0 in [(20, 20), (290, 20), (20, 270), (290, 270), (20, 520), (290, 520)]:
+        for k in range(10):
+            thickness = 3 if k % 3 == 0 else 1
+            offset = int(round(k * cell))
+            cv2.line(page, (x0 + offset, y0), (x0 + offset, y0 + size), 0, thickness)
+            cv2.line(page, (x0, y0 + offset), (x0 + size, y0 + offset), 0, thickness)
+        for i, j, digit in [(0, 0, 5), (4, 4, 3), (8, 8, 9)]:
+            origin = (int(x0 + j * cell + cell * 0.25), int(y0 + i * cell + cell * 0.8))
+            cv2.putText(page, str(digit), origin, cv2.FONT_HERSHEY_SIMPLEX, cell / 35, 0, 2)
+    
+    if distort:
+        h, w = page.shape
+        src = np.float32([[0, 0], [w, 0], [w, h], [0, h]])
+        dst = np.float32([[20, 10], [w - 20, 30], [w - 5, h - 10], [5, h - 20]])
+        page = cv2.warpPerspective(page, cv2.getPerspectiveTransform(src, dst), (w, h), borderValue=255)
+        noise = np.random.default_rng(1).normal(0, 8, page.shape)
+        page = np.clip(page + noise, 0, 255).astype(np.uint8)
+    
+    cv2.imwrite(path, page)
+
+def page_test(path="synthetic_page.png"):
+    """Check page-mode grid detection on synthetic pages with and without a frame."""
+    recognizer = SudokuRecognizer()
+    for frame, distort in ((False, False), (True, False), (True, True)):
+        draw_synthetic_page(path, frame, distort)
+        img, gray, original = recognizer.preprocess_image(path)
+        thresholds = recognizer.create_multiple_thresholds(gray)
+        grids = recognizer.find_sudoku_grids(thresholds, gray)
+        os.remove(path)
+        
+        rects = [cv2.boundingRect(grid) for grid in grids]
+        print(f"frame={frame}, distort={distort}: {len(grids)} grid(s) {rects}")
+        assert len(grids) == 6, "expected all six grids"
+        assert all(190 < r[2] < 280 and 190 < r[3] < 280 for r in rects), "expected grid-sized quads"
+        assert rects == sorted(rects, key=lambda r: (r[1] // 125, r[0])), "expected reading order"
+    
+    print("✓ Page detection test passed")
+
+def decode_test():
+    """Check decode_grid on simulated OCR readings, with Tesseract stubbed out."""
+    import time
+    
+    solution = np.array([int(x) for x in
+        "534678912672195348198342567859761423426853791713924856961537284287419635345286179"]).reshape(9, 9)
+    puzzle = np.array([int(x) for x in
+        "530070000600195000098000060800060003400803001700020006060000280000419005000080079"]).reshape(9, 9)
+    
+    def run(misreads, rereads, max_steps=200000):
+        """misreads: {index: (top digit, confidence)}; rereads: {index: [(digit, confidence), ...]}."""
+        recognizer = SudokuRecognizer()
+        recognizer.cell_hypotheses = lambda padded, configs: rereads.get(padded, [])
+        prepared = [index if puzzle.flat[index] else None for index in range(81)]
+        hypotheses = [[(int(digit), 0.9)] if digit else [(0, 1.0)] for digit in puzzle.flat]
+        for index, reading in misreads.items():
+            hypotheses[index] = [reading]
+        
+        start = time.perf_counter()
+        result = recognizer.decode_grid(prepared, hypotheses, max_steps=max_steps)
+        elapsed = (time.perf_counter() - start) * 1000
+        top = np.array([h[0][0] for h in hypotheses]).reshape(9, 9)
+        return result, top, elapsed
+    
+    # 1. The 3 at (0, 1) read as 5 clashes with the 5 at (0, 0); a second config reads 3
+    result, top, elapsed = run({1: (5, 0.6)}, {1: [(5, 0.6), (3, 0.5)]})
+    print(f"conflict: {elapsed:.0f}ms")
+    assert np.array_equal(result, puzzle), "conflicting misread should be corrected"
+    assert SudokuSolver().solve(result) is not None
+    
+    # 2. The 5 at (0, 0) read as 1 breaks no rule but leaves the puzzle unsolvable
+    result, top, elapsed = run({0: (1, 0.4)}, {0: [(1, 0.4), (5, 0.35)]})
+    print(f"unsolvable: {elapsed:.0f}ms")
+    assert np.array_equal(result, puzzle), "unsolvable misread should be corrected"
+    
+    # 3. Same misread, but the budget runs out before the corrected grid is solved
+    result, top, elapsed = run({0: (1, 0.4)}, {0: [(1, 0.4), (5, 0.35)]}, max_steps=50000)
+    print(f"budget exhausted: {elapsed:.0f}ms")
+    assert np.array_equal(result, top), "exhausted budget should fall back to the top readings"
+    
+    assert np.array_equal(SudokuSolver().solve(puzzle), solution)
+    print("✓ Decoder test passed")
+
 if __name__ == "__main__":
-    # Test with a sample image
-    test_image = "sudoku_test.jpg"  # Replace with your image path
-    quick_test(test_image)
\ No newline at end of file
+    import sys
+    if "--page-test" in sys.argv:
+        page_test()
+    elif "--decode-test" in sys.argv:
+        decode_test()
+    else:
+        # Test with a sample image
+        test_image = "sudoku_test.jpg"  # Replace with your image path
+        quick_test(test_image)
\ No newline at end of file
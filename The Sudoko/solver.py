@@ -54,6 +54,43 @@ class SudokuSolver:
         
         return None  # No solution found
     
+    def solve_limited(self, grid, max_steps, max_solutions=1):
+        """Backtracking search that gives up after max_steps candidate checks.
+        
+        Returns (solutions, steps_used, finished). finished is False when the
+        budget ran out before the search could find max_solutions or rule them out.
+        """
+        solutions = []
+        steps = [0]
+        finished = self.search_limited(grid.copy(), solutions, max_solutions, steps, max_steps)
+        return solutions, steps[0], finished
+    
+    def search_limited(self, grid, solutions, max_solutions, steps, max_steps):
+        """Recursive step of solve_limited; returns False once the step budget is spent."""
+        if len(solutions) >= max_solutions:
+            return True
+        
+        empty = self.find_empty_cell(grid)
+        if not empty:
+            solutions.append(grid.copy())
+            return True
+        
+        row, col = empty
+        for num in range(1, 10):
+            steps[0] += 1
+            if steps[0] > max_steps:
+                return False
+            
+            if self.is_valid(grid, row, col, num):
+                grid[row][col] = num
+                if not self.search_limited(grid, solutions, max_solutions, steps, max_steps):
+                    return False
+                grid[row][col] = 0  # Backtrack
+                if len(solutions) >= max_solutions:
+                    return True
+        
+        return True
+    
     def is_valid_puzzle(self, grid):
         """Check if the puzzle is valid (has unique solution)."""
         # Check for duplicate numbers in rows, columns, boxes
@@ -0,0 +1,295 @@
+# tracker.py - Sudoku recognition over a stream of camera/video frames
+import cv2
+import numpy as np
+from recognizer import SudokuRecognizer
+
+class SudokuTracker:
+    """Track a Sudoku grid across successive frames and re-read only changed cells."""
+
+    def __init__(self, recognizer=None, stable_frames=3, warp_size=450, max_side=640, max_missed_frames=5):
+        self.recognizer = recognizer or SudokuRecognizer()
+        self.stable_frames = stable_frames  # Unchanged readings needed before stopping
+        self.max_missed_frames = max_missed_frames  # Frames without a grid before dropping the corners
+        self.warp_size = warp_size
+        self.max_side = max_side
+
+        # Corner movement (px) below which the previous homography is reused. Keep this
+        # sub-pixel: a stale warp shifts every cell and sends unchanged digits back to OCR,
+        # while recomputing the homography costs microseconds.
+        self.reuse_tolerance = 0.1
+        # Max mean corner drift, as a fraction of grid side, for local refinement
+        self.max_drift = 0.15
+        # Mean absolute difference (0-255) on an 8x8 thumbnail that marks a cell as changed
+        self.cell_change_threshold = 12.0
+
+        self.reset()
+
+    def reset(self):
+        """Forget the tracked grid, e.g. when the camera moves to another puzzle."""
+        self.corners = None
+        self.homography = None
+        self.grid = np.zeros((9, 9), dtype=int)
+        self.signatures = [None] * 81
+        self.stable_count = 0
+        self.stable = False
+        self.missed_frames = 0
+
+    def detect_corners(self, gray):
+        """Full detection with every threshold strategy (first frame or lost track)."""
+        thresholds = self.recognizer.create_multiple_thresholds(gray)
+        contour = self.recognizer.find_sudoku_grid(thresholds)
+        # The line-detection fallback returns a fixed quad even on empty frames
+        if contour is None or not self.recognizer.has_grid_lines(gray, contour):
+            return None
+        return self.subpixel_corners(gray, self.recognizer.order_points(contour))
+
+    def subpixel_corners(self, gray, corners):
+        """Snap polygon corners to the grid's actual corners so they don't jitter between frames."""
+        criteria = (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 20, 0.05)
+        refined = cv2.cornerSubPix(gray, corners.reshape(-1, 1, 2).copy(), (5, 5), (-1, -1), criteria)
+        return refined.reshape(4, 2)
+
+    def refine_corners(self, gray, corners):
+        """Look for the grid only near its previous position, with a single threshold."""
+        x, y, w, h = cv2.boundingRect(corners.astype(np.int32))
+        margin = int(self.max_drift * max(w, h)) + 2
+        x0, y0 = max(x - margin, 0), max(y - margin, 0)
+        x1, y1 = min(x + w + margin, gray.shape[1]), min(y + h + margin, gray.shape[0])
+
+        roi = gray[y0:y1, x0:x1]
+        thresh = cv2.adaptiveThreshold(
+            roi, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY_INV, 11, 2
+        )
+
+        best, best_drift = None, self.max_drift * max(w, h)
+        for area, contour, rect in self.recognizer.find_grid_contours(thresh):
+            candidate = self.recognizer.order_points(contour) + np.float32([x0, y0])
+            drift = np.mean(np.linalg.norm(candidate - corners, axis=1))
+            if drift < best_drift:
+                best, best_drift = candidate, drift
+
+        if best is None:
+            return None
+        return self.subpixel_corners(gray, best)
+
+    def update_homography(self, corners):
+        """Reuse the last homography unless the corners actually moved."""
+        if (self.homography is not None and
+                np.max(np.linalg.norm(corners - self.corners, axis=1)) < self.reuse_tolerance):
+            return
+
+        size = self.warp_size
+        dst = np.array([
+            [0, 0],
+            [size - 1, 0],
+            [size - 1, size - 1],
+            [0, size - 1]
+        ], dtype="float32")
+        self.corners = corners
+        self.homography = cv2.getPerspectiveTransform(corners, dst)
+
+    def cell_signature(self, cell):
+        """Small thumbnail used to tell whether a cell's content changed."""
+        if cell is None:
+            return None
+        return cv2.resize(cell, (8, 8), interpolation=cv2.INTER_AREA).astype(np.float32)
+
+    def process_frame(self, frame):
+        """Feed one BGR or grayscale frame; returns the current 9x9 reading or None if no grid.
+
+        A frame without a grid (blur, occlusion) returns None but keeps the readings;
+        the tracked corners are dropped, and full detection resumes, only after
+        max_missed_frames such frames in a row.
+        Once readings have been unchanged for stable_frames frames, the tracker stops
+        processing and returns the stable grid until reset() is called.
+        """
+        if self.stable:
+            return self.grid
+
+        _, gray = self.recognizer.resize_and_gray(frame, self.max_side)
+
+        # Step 1: Track corners locally; full detection only when nothing is tracked
+        if self.corners is not None:
+            corners = self.refine_corners(gray, self.corners)
+        else:
+            corners = self.detect_corners(gray)
+            self.homography = None
+
+        if corners is None:
+            # Keep readings and corners through brief losses (blur, a hand over the grid)
+            self.missed_frames += 1
+            if self.missed_frames >= self.max_missed_frames:
+                self.corners = None
+                self.homography = None
+            return None
+        self.missed_frames = 0
+
+        # Step 2: Warp with the (possibly reused) homography
+        self.update_homography(corners)
+        warped = cv2.warpPerspective(gray, self.homography, (self.warp_size, self.warp_size))
+
+        # Step 3: Re-read only the cells whose content changed
+        cells = self.recognizer.extract_cells(warped)
+        changed = []
+        for index, cell in enumerate(cells):
+            signature = self.cell_signature(cell)
+            previous = self.signatures[index]
+            if (signature is None or previous is None or
+                    np.mean(np.abs(signature - previous)) > self.cell_change_threshold):
+                self.signatures[index] = signature
+                changed.append(index)
+
+        grid = self.grid.copy()
+        if changed:
+            digits = self.recognizer.recognize_cells_batch([cells[index] for index in changed])
+            for index, digit in zip(changed, digits):
+                grid[index // 9][index % 9] = digit
+
+        # Step 4: Stop once the readings settle
+        if np.array_equal(grid, self.grid) and np.any(grid != 0):
+            self.stable_count += 1
+        else:
+            self.stable_count = 0
+        self.grid = grid
+        self.stable = self.stable_count >= self.stable_frames
+
+        if self.recognizer.debug:
+            print(f"Tracked frame: {len(changed)} cell(s) re-read, stable for {self.stable_count}")
+
+        return self.grid
+
+# Helper function for testing
+def track_video(source=0):
+    """Read frames from a camera index or video file until the grid is stable."""
+    capture = cv2.VideoCapture(source)
+    tracker = SudokuTracker()
+
+    try:
+        while capture.isOpened():
+            ok, frame = capture.read()
+            if not ok:
+                break
+
+            grid = tracker.process_frame(frame)
+            if tracker.stable:
+                print("\n🎉 Stable grid:")
+                for i, row in enumerate(grid):
+                    print(f"Row {i+1}: {row}")
+                return grid
+    finally:
+        capture.release()
+
+    print("\n❌ Grid never stabilized")
+    return None
+
+def draw_synthetic_frame(digits, shift=(0.0, 0.0), noise=2.0, seed=0, occluded=False):
+    """Draw a 640x480 camera-like frame of a grid, moved by a sub-pixel shift, with noise."""
+    frame = np.full((480, 640), 255, np.uint8)
+    x0, y0, size = 170, 90, 300
+    cell = size / 9
+    for k in range(10):
+        thickness = 3 if k % 3 == 0 else 1
+        offset = int(round(k * cell))
+        cv2.line(frame, (x0 + offset, y0), (x0 + offset, y0 + size), 0, thickness)
+        cv2.line(frame, (x0, y0 + offset), (x0 + size, y0 + offset), 0, thickness)
+    for i in range(9):
+        for j in range(9):
+            if digits[i][j]:
+                origin = (int(x0 + j * cell + cell * 0.3), int(y0 + i * cell + cell * 0.75))
+                cv2.putText(frame, str(digits[i][j]), origin, cv2.FONT_HERSHEY_SIMPLEX, cell / 40, 0, 2)
+
+    if occluded:
+        # A hand over most of the grid
+        cv2.rectangle(frame, (120, 60), (520, 330), 110, -1)
+
+    shift_matrix = np.float32([[1, 0, shift[0]], [0, 1, shift[1]]])
+    frame = cv2.warpAffine(frame, shift_matrix, (640, 480), borderValue=255)
+    frame = frame + np.random.default_rng(seed).normal(0, noise, frame.shape)
+    return np.clip(frame, 0, 255).astype(np.uint8)
+
+def frame_test(stable_frames=3):
+    """Run the tracker over shaken, noisy synthetic frames with OCR stubbed out.
+
+    Checks that full detection only runs on the first frame, the homography is reused
+    only when the grid hasn't moved, an occluded frame keeps the readings, camera shake
+    of 1-2px sends nothing to recognize_cells_batch while a newly written digit sends
+    exactly that cell, and the tracker stops once readings are stable.
+    Timings exclude Tesseract, which the stub replaces.
+    """
+    import time
+
+    digits = np.zeros((9, 9), dtype=int)
+    digits[0][0], digits[2][6], digits[4][4], digits[8][8] = 5, 7, 3, 9
+    updated = digits.copy()
+    updated[6][2] = 4  # The user writes in a digit
+
+    recognizer = SudokuRecognizer()
+    tracker = SudokuTracker(recognizer, stable_frames=stable_frames)
+
+    # Stub OCR: any non-empty cell reads as 1, and count the cells that would reach Tesseract
+    batches = []
+    def stub_batch(cells):
+        readings = [0 if cell is None or recognizer.prepare_cell(cell, 0, 0) is None else 1 for cell in cells]
+        batches[-1] += sum(readings)
+        return readings
+    recognizer.recognize_cells_batch = stub_batch
+
+    detections = []
+    detect_corners = tracker.detect_corners
+    def counting_detect(gray):
+        detections[-1] += 1
+        return detect_corners(gray)
+    tracker.detect_corners = counting_detect
+
+    # (shift, noise seed, grid content, occluded); frame 2 repeats frame 1 exactly
+    frames = [
+        ((0, 0), 0, digits, False),
+        ((1, 1), 1, digits, False),
+        ((1, 1), 1, digits, False),
+        ((1, 1), 3, digits, True),
+        ((2, 0), 4, updated, False),
+        ((1.5, 2), 5, updated, False),
+        ((0, 1), 6, updated, False),
+        ((2, 2), 7, updated, False),
+        ((1, 0), 8, updated, False),
+    ]
+    changed_at = 4
+    homographies = []
+    stable_flags = []
+    for index, (shift, seed, content, occluded) in enumerate(frames):
+        batches.append(0)
+        detections.append(0)
+        frame = draw_synthetic_frame(content, shift, seed=seed, occluded=occluded)
+
+        start = time.perf_counter()
+        grid = tracker.process_frame(frame)
+        elapsed = (time.perf_counter() - start) * 1000
+
+        homographies.append(tracker.homography)
+        stable_flags.append(tracker.stable)
+        print(f"frame {index}: shift={shift}, {elapsed:5.1f}ms, full detection={detections[-1]}, "
+              f"cells to OCR={batches[-1]}, stable={tracker.stable}")
+
+        if occluded:
+            assert grid is None, "occluded frame should report no grid"
+            assert tracker.corners is not None and np.any(tracker.grid != 0), "readings should survive one lost frame"
+
+    assert detections[0] == 1 and sum(detections) == 1, "full detection should only run on frame 0"
+    assert batches[0] == np.count_nonzero(digits), "first frame reads every digit"
+    assert batches[changed_at] == 1, "a new digit should re-read only its cell"
+    assert all(b == 0 for i, b in enumerate(batches) if i not in (0, changed_at)), \
+        "camera shake alone should send nothing to OCR"
+    assert homographies[2] is homographies[1], "homography should be reused when the grid has not moved"
+    assert homographies[4] is not homographies[2], "homography should be recomputed after the grid moves"
+    # Readings restart counting at the change; occluded frames give none
+    readings = [i for i, frame in enumerate(frames) if i > changed_at and not frame[3]]
+    assert stable_flags.index(True) == readings[stable_frames - 1], "stable should turn on after stable_frames readings"
+    assert batches[-1] == 0 and detections[-1] == 0, "tracker should stop once readings are stable"
+    print("✓ Frame tracking test passed")
+
+if __name__ == "__main__":
+    import sys
+    if "--frame-test" in sys.argv:
+        frame_test()
+    else:
+        track_video(0)